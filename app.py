@@ -6,30 +6,389 @@ A comprehensive tool to visualize and analyze GitHub repositories
 
 import os
 import re
+import sys
 import ast
 import json
-import argparse
-import subprocess
+import copy
+import shutil
+import sqlite3
+import hashlib
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 from collections import defaultdict, Counter
 from dataclasses import dataclass
-import base64
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 try:
     import requests
     from github import Github
     import networkx as nx
+    import matplotlib
+    matplotlib.use('Agg')  # Plots are rendered off-screen, possibly in worker processes
     import matplotlib.pyplot as plt
     import seaborn as sns
+    import numpy as np
     import pandas as pd
-    from jinja2 import Template
+    from jinja2 import Environment, DictLoader, FileSystemBytecodeCache, select_autoescape
+    from markupsafe import Markup, escape
 except ImportError as e:
     print(f"Missing required package: {e}")
     print("Install with: pip install PyGithub requests networkx matplotlib seaborn pandas jinja2")
     exit(1)
 
+try:
+    # Optional: persistent HTTP cache for GitHub API responses
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+try:
+    # Optional: faster JSON serialization
+    import orjson
+except ImportError:
+    orjson = None
+
+# Local cache location for GitHub API responses
+CACHE_DIR = os.path.join(Path.home(), '.cache', 'gitdiagram')
+API_CACHE_EXPIRE_SECONDS = 3600
+TEMPLATE_CACHE_DIR = os.path.join(CACHE_DIR, 'templates')
+REPORT_CACHE_DIR = os.path.join(CACHE_DIR, 'reports')
+
+# Files written to the output directory; the JSON report comes last so a
+# cached copy only counts as complete once everything else is in place
+OUTPUT_FILES = [
+    'AUTO_README.md',
+    'file_structure.html',
+    'dependency_graph.png',
+    'commit_heatmap.png',
+    'language_distribution.png',
+    'contributor_analysis.png',
+    'index.html',
+    'analysis_report.json'
+]
+
+# File extension to language mapping
+LANGUAGE_EXTENSIONS = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.java': 'Java',
+    '.cpp': 'C++',
+    '.c': 'C',
+    '.cs': 'C#',
+    '.go': 'Go',
+    '.rs': 'Rust',
+    '.php': 'PHP',
+    '.rb': 'Ruby',
+    '.swift': 'Swift',
+    '.kt': 'Kotlin',
+    '.scala': 'Scala',
+    '.r': 'R',
+    '.sql': 'SQL',
+    '.sh': 'Shell',
+    '.yml': 'YAML',
+    '.yaml': 'YAML',
+    '.json': 'JSON',
+    '.xml': 'XML',
+    '.html': 'HTML',
+    '.css': 'CSS',
+    '.md': 'Markdown'
+}
+
+_REPO_URL_PATTERNS = [re.compile(pattern) for pattern in (
+    r'github\.com/([^/]+)/([^/]+?)(?:\.git)?/?$',
+    r'github\.com/([^/]+)/([^/]+)/tree/',
+    r'^([^/]+)/([^/]+)$'  # Direct format: owner/repo
+)]
+
+# Matches either "import x" (group 1) or "from x import" (group 2)
+_IMPORT_LINE_RE = re.compile(r'^\s*(?:import\s+([^\s#]+)|from\s+([^\s#]+)\s+import)')
+
+# Lines scanned unconditionally by the regex fallback before it stops at the first non-import line
+IMPORT_SCAN_HEADER_LINES = 200
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Cheap check on raw file bytes for any line starting with import/from (after an optional UTF-8 BOM)
+_IMPORT_PREFILTER = re.compile(rb'(?m)^(?:\xef\xbb\xbf)?\s*(?:import|from)\s')
+
+# Number of concurrent GitHub API requests when fetching file contents
+MAX_FETCH_WORKERS = 32
+
+# Languages whose lines of code are counted in cloned repositories
+CODE_EXTENSIONS = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.java': 'Java',
+    '.cpp': 'C++',
+    '.c': 'C'
+}
+
+# Directories skipped when walking a cloned repository (hidden ones are skipped too)
+_IGNORE_DIRS = frozenset({
+    'node_modules', '__pycache__', '.git', '.venv', 'venv', 'dist', 'build',
+    '.mypy_cache', '.pytest_cache', '.tox', 'target'
+})
+
+# Read size used when counting lines in cloned files
+LINE_COUNT_CHUNK_SIZE = 1 << 16
+
+# Jinja2 templates, compiled on first use and cached
+README_TEMPLATE = """
+# {{ repo_name }}
+
+{{ description }}
+
+## 📊 Repository Overview
+- **Language**: {{ language }}
+- **Stars**: {{ stars }}
+- **Forks**: {{ forks }}
+- **Created**: {{ created_at }}
+- **Last Updated**: {{ updated_at }}
+
+## 📁 Project Structure
+```
+{{ file_structure }}
+```
+
+## 🔗 Dependencies
+{% if top_dependencies %}
+### Top Dependencies:
+{% for dep in top_dependencies %}
+- {{ dep }}
+{% endfor %}
+{% endif %}
+
+## 👥 Contributors
+{% if contributors %}
+### Top Contributors:
+{% for contributor, stats in contributors.items() %}
+- **{{ contributor }}**: {{ stats.contributions }} contributions
+{% endfor %}
+{% endif %}
+
+## 📈 Activity
+- Total commits analyzed: {{ total_commits }}
+- Active contributors: {{ active_contributors }}
+
+---
+*Generated by GitDiagram++ - Repository Visualizer & Analyzer*
+"""
+
+STRUCTURE_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>{{ repo_name }} - File Structure</title>
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/mermaid/10.6.1/mermaid.min.js"></script>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        h1 { color: #333; text-align: center; }
+        .mermaid { text-align: center; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>📁 {{ repo_name }} - File Structure</h1>
+        <div class="mermaid">
+{{ mermaid_diagram }}
+        </div>
+    </div>
+    <script>
+        mermaid.initialize({startOnLoad:true, theme: 'default'});
+    </script>
+</body>
+</html>
+"""
+
+REPORT_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>{{ repo_name }} - Analysis Report</title>
+    <style>
+        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; background: #f8f9fa; }
+        .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 12px; margin-bottom: 30px; text-align: center; }
+        .card { background: white; padding: 25px; margin-bottom: 25px; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
+        .stat-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; }
+        .stat-item { text-align: center; padding: 20px; background: #f8f9fa; border-radius: 8px; }
+        .stat-number { font-size: 2em; font-weight: bold; color: #667eea; display: block; }
+        .stat-label { color: #666; margin-top: 5px; }
+        .insights { background: #e8f5e8; border-left: 4px solid #28a745; padding: 20px; }
+        .insight-item { margin: 10px 0; padding: 8px 0; }
+        .files-list { max-height: 300px; overflow-y: auto; background: #f8f9fa; padding: 15px; border-radius: 8px; }
+        h1, h2, h3 { color: #333; }
+        .nav { background: white; padding: 15px; border-radius: 8px; margin-bottom: 20px; }
+        .nav a { margin-right: 15px; color: #667eea; text-decoration: none; font-weight: 500; }
+        .nav a:hover { text-decoration: underline; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🔍 {{ repo_name }}</h1>
+            <p>{{ description }}</p>
+            <p><strong>{{ language }}</strong> • ⭐ {{ stars }} • 🍴 {{ forks }}</p>
+        </div>
+        
+        <div class="nav">
+            <a href="#overview">📊 Overview</a>
+            <a href="#structure">📁 Structure</a>
+            <a href="#dependencies">🔗 Dependencies</a>
+            <a href="#activity">📈 Activity</a>
+            <a href="#insights">💡 Insights</a>
+        </div>
+
+        <div id="overview" class="card">
+            <h2>📊 Repository Overview</h2>
+            <div class="stat-grid">
+                <div class="stat-item">
+                    <span class="stat-number">{{ total_files }}</span>
+                    <div class="stat-label">Total Files</div>
+                </div>
+                <div class="stat-item">
+                    <span class="stat-number">{{ total_dependencies }}</span>
+                    <div class="stat-label">Dependencies</div>
+                </div>
+                <div class="stat-item">
+                    <span class="stat-number">{{ total_commits }}</span>
+                    <div class="stat-label">Commits Analyzed</div>
+                </div>
+                <div class="stat-item">
+                    <span class="stat-number">{{ active_contributors }}</span>
+                    <div class="stat-label">Active Contributors</div>
+                </div>
+            </div>
+        </div>
+
+        <div id="structure" class="card">
+            <h2>📁 File Structure</h2>
+            <p><a href="file_structure.html" target="_blank">🎨 View Interactive Diagram</a></p>
+            <div class="files-list">
+                <pre>{{ file_structure_text }}</pre>
+            </div>
+        </div>
+
+        <div id="dependencies" class="card">
+            <h2>🔗 Dependencies Analysis</h2>
+            {% if dependencies %}
+            <p>Dependency graph shows relationships between modules.</p>
+            <p><a href="dependency_graph.png" target="_blank">📊 View Dependency Graph</a></p>
+            <h3>Top Dependencies:</h3>
+            <ul>
+            {% for dep in top_dependencies %}
+                <li><code>{{ dep }}</code></li>
+            {% endfor %}
+            </ul>
+            {% else %}
+            <p>No dependencies detected or analysis unavailable.</p>
+            {% endif %}
+        </div>
+
+        <div id="activity" class="card">
+            <h2>📈 Repository Activity</h2>
+            {% if most_changed_files %}
+            <h3>Most Frequently Changed Files:</h3>
+            <ol>
+            {% for file, changes in most_changed_files %}
+                <li><code>{{ file }}</code> - {{ changes }} changes</li>
+            {% endfor %}
+            </ol>
+            <p><a href="commit_heatmap.png" target="_blank">🔥 View Commit Heatmap</a></p>
+            {% endif %}
+            
+            <p><a href="language_distribution.png" target="_blank">📊 View Language Distribution</a></p>
+            <p><a href="contributor_analysis.png" target="_blank">👥 View Contributor Analysis</a></p>
+        </div>
+
+        <div id="insights" class="card">
+            <h2>💡 Analysis Insights</h2>
+            <div class="insights">
+            {% for insight in insights %}
+                <div class="insight-item">{{ insight }}</div>
+            {% endfor %}
+            </div>
+        </div>
+
+        <div class="card">
+            <h2>📋 Generated Files</h2>
+            <ul>
+                <li><a href="AUTO_README.md">📝 Auto-generated README</a></li>
+                <li><a href="analysis_report.json">📊 Detailed JSON Report</a></li>
+                <li><a href="file_structure.html">🌳 Interactive File Structure</a></li>
+                <li><a href="dependency_graph.png">🔗 Dependency Graph</a></li>
+                <li><a href="commit_heatmap.png">🔥 Commit Heatmap</a></li>
+                <li><a href="language_distribution.png">📈 Language Distribution</a></li>
+                <li><a href="contributor_analysis.png">👥 Contributor Analysis</a></li>
+            </ul>
+        </div>
+    </div>
+    <script id="report-data" type="application/json">{{ report_json }}</script>
+</body>
+</html>
+"""
+
+_TEMPLATES = DictLoader({
+    'AUTO_README.md': README_TEMPLATE,
+    'file_structure.html': STRUCTURE_HTML_TEMPLATE,
+    'index.html': REPORT_HTML_TEMPLATE
+})
+
+@lru_cache(maxsize=None)
+def _get_template_env(bytecode_cache: bool = True) -> Environment:
+    """Get the shared template environment, optionally persisting compiled templates on disk"""
+    cache = None
+    if bytecode_cache:
+        try:
+            os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+            cache = FileSystemBytecodeCache(TEMPLATE_CACHE_DIR)
+        except OSError as e:
+            print(f"Warning: Template bytecode cache disabled: {e}")
+    
+    # HTML output is escaped, Markdown output is not
+    return Environment(
+        loader=_TEMPLATES,
+        autoescape=select_autoescape(['html']),
+        bytecode_cache=cache,
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+
+def _write_json(data, path: str):
+    """Write data as indented UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, default=str, ensure_ascii=False)
+
+def _json_for_html(data) -> str:
+    """Serialize data as compact JSON that is safe to embed in an HTML <script> tag"""
+    if orjson is not None:
+        text = orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    else:
+        text = json.dumps(data, default=str, ensure_ascii=False, separators=(',', ':'))
+    return text.replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
+
+def _read_json(path: str):
+    """Read a JSON file, using orjson when available"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+@lru_cache(maxsize=32)
+def _load_cached_report(cache_key: str) -> Dict:
+    """Load a cached analysis report, keeping recently used ones in memory"""
+    return _read_json(os.path.join(REPORT_CACHE_DIR, cache_key, 'analysis_report.json'))
+
 @dataclass
 class FileNode:
     """Represents a file or directory in the repository"""
@@ -48,20 +407,114 @@ class Dependency:
     to_module: str
     import_type: str  # 'import', 'from_import'
 
+class _ImportCollector(ast.NodeVisitor):
+    """Collect import statements, skipping function and class bodies"""
+    
+    # Visitor method per (collector class, AST node class), resolved once instead of on every node
+    _visitors = {}
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.dependencies = []
+    
+    def visit(self, node):
+        cls = type(self)
+        key = (cls, type(node))
+        visitor = self._visitors.get(key)
+        if visitor is None:
+            visitor = getattr(cls, 'visit_' + key[1].__name__, cls.generic_visit)
+            self._visitors[key] = visitor
+        return visitor(self, node)
+    
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.dependencies.append(Dependency(
+                from_file=self.file_path,
+                to_module=alias.name,
+                import_type='import'
+            ))
+    
+    def visit_ImportFrom(self, node):
+        if node.module:
+            self.dependencies.append(Dependency(
+                from_file=self.file_path,
+                to_module=node.module,
+                import_type='from_import'
+            ))
+    
+    def visit_FunctionDef(self, node):
+        pass
+    
+    visit_AsyncFunctionDef = visit_ClassDef = visit_FunctionDef
+    
+    def generic_visit(self, node):
+        # Only descend into statement blocks (module, if/try/with/loops/match), never expressions
+        for field in ('body', 'handlers', 'orelse', 'finalbody', 'cases'):
+            for child in getattr(node, field, ()):
+                self.visit(child)
+
 class GitDiagramPlus:
     """Main class for repository analysis and visualization"""
     
-    def __init__(self, github_token: str = None):
+    # Output template names; subclasses may override these
+    readme_template = 'AUTO_README.md'
+    structure_template = 'file_structure.html'
+    report_template = 'index.html'
+    
+    # Name of the API cache installed by this process, if any
+    _api_cache_name = None
+    
+    def __init__(self, github_token: str = None, api_cache: bool = True, template_cache: bool = True,
+                 report_cache: bool = True):
         self.github_token = github_token
+        self.report_cache = report_cache
+        if api_cache:
+            self._install_api_cache(github_token)
+        self.template_env = _get_template_env(template_cache)
         self.github_client = Github(github_token) if github_token else Github()
         self.repo_data = {}
         self.file_structure = {}
         self.dependencies = []
         self.commit_data = {}
-        self.contributor_data = defaultdict(list)
-        
-    def analyze_repository(self, repo_url: str, output_dir: str = "output") -> Dict:
-        """Main method to analyze a repository comprehensively"""
+        self.contributor_data = defaultdict(Counter)
+        self._tree_entries = None
+        self._tree_items = None
+        self._tree_text = None
+        self._python_paths = []
+        
+    @classmethod
+    def _install_api_cache(cls, github_token: str = None):
+        """Cache GitHub API responses on disk, revalidating with ETags once expired"""
+        if requests_cache is None:
+            return
+        # requests-cache leaves the Authorization header out of its keys, so use one
+        # cache per token to keep responses from being served to other credentials
+        name = 'github_api'
+        if github_token:
+            name += '_' + hashlib.sha256(github_token.encode('utf-8')).hexdigest()[:16]
+        if requests_cache.is_installed():
+            if cls._api_cache_name == name:
+                return
+            requests_cache.uninstall_cache()
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            requests_cache.install_cache(
+                os.path.join(CACHE_DIR, name),
+                backend='sqlite',
+                expire_after=API_CACHE_EXPIRE_SECONDS,
+                cache_control=True
+            )
+            cls._api_cache_name = name
+        except (OSError, sqlite3.Error) as e:
+            cls._api_cache_name = None
+            print(f"Warning: GitHub API cache disabled: {e}")
+        
+    def analyze_repository(self, repo_url: str, output_dir: str = "output", refresh: bool = False) -> Dict:
+        """Main method to analyze a repository comprehensively
+        
+        Results of an earlier run on the same default branch commit are reused
+        unless refresh is set or the analyzer was created with report_cache=False.
+        """
         print(f"🔍 Analyzing repository: {repo_url}")
         
         # Extract repo info from URL
@@ -74,9 +527,23 @@ class GitDiagramPlus:
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
+        # Tree entries are fetched lazily per repository
+        self._tree_entries = None
+        
         try:
             # Get repository object
             repo = self.github_client.get_repo(f"{owner}/{repo_name}")
+            
+            cache_key = self._report_cache_key(repo_url, repo) if self.report_cache else None
+            if cache_key and not refresh:
+                report = self._restore_cached_report(cache_key, output_dir)
+                if report is not None:
+                    print(f"♻️ Reusing cached analysis. Results copied to '{output_dir}'.")
+                    return report
+            
+            # Output files left by earlier runs must not be cached under this key
+            previous_outputs = self._output_mtimes(output_dir) if cache_key else {}
+            
             self.repo_data = {
                 'name': repo.name,
                 'owner': owner,
@@ -88,17 +555,22 @@ class GitDiagramPlus:
                 'updated_at': repo.updated_at.isoformat()
             }
             
-            print("📁 Phase 1: Analyzing file structure...")
-            self._analyze_file_structure(repo)
-            
-            print("🔗 Phase 2: Building dependency graph...")
-            self._analyze_dependencies(repo)
-            
-            print("📊 Phase 3: Gathering commit insights...")
-            self._analyze_commit_history(repo)
-            
-            print("👥 Phase 4: Analyzing contributors...")
-            self._analyze_contributors(repo)
+            # Commit and contributor analysis use different endpoints than the
+            # file tree, so they run alongside phases 1 and 2
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                print("📁 Phase 1: Analyzing file structure...")
+                structure_future = executor.submit(self._analyze_file_structure, repo)
+                
+                print("📊 Phase 3: Gathering commit insights...")
+                print("👥 Phase 4: Analyzing contributors...")
+                activity_future = executor.submit(self._analyze_activity, repo)
+                
+                # Dependencies need the Python files found in the file structure
+                structure_future.result()
+                print("🔗 Phase 2: Building dependency graph...")
+                self._analyze_dependencies(repo)
+                
+                activity_future.result()
             
             print("📋 Phase 5: Generating documentation...")
             self._generate_documentation(repo, output_dir)
@@ -109,6 +581,9 @@ class GitDiagramPlus:
             # Generate comprehensive report
             report = self._generate_report(output_dir)
             
+            if cache_key:
+                self._save_cached_report(cache_key, output_dir, previous_outputs)
+            
             print(f"✅ Analysis complete! Check the '{output_dir}' directory for results.")
             return report
             
@@ -116,131 +591,161 @@ class GitDiagramPlus:
             print(f"❌ Error analyzing repository: {e}")
             raise
     
+    def _report_cache_key(self, repo_url: str, repo) -> Optional[str]:
+        """Key cached results by repository URL, token and default branch head commit"""
+        try:
+            head_sha = repo.get_branch(repo.default_branch).commit.sha
+        except Exception as e:
+            # Empty repositories have no default branch to resolve
+            print(f"Warning: Analysis cache disabled for this repository: {e}")
+            return None
+        token = self.github_token or ''
+        return hashlib.sha256(f"{repo_url}\0{token}\0{head_sha}".encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _output_mtimes(output_dir: str) -> Dict[str, int]:
+        """Map each output file present in output_dir to its modification time"""
+        mtimes = {}
+        for name in OUTPUT_FILES:
+            try:
+                mtimes[name] = os.stat(os.path.join(output_dir, name)).st_mtime_ns
+            except OSError:
+                pass
+        return mtimes
+    
+    @staticmethod
+    def _restore_cached_report(cache_key: str, output_dir: str) -> Optional[Dict]:
+        """Copy cached output files into output_dir and return the cached report, if any"""
+        cache_dir = os.path.join(REPORT_CACHE_DIR, cache_key)
+        # The in-memory copy may outlive a cache directory removed on disk
+        if not os.path.exists(os.path.join(cache_dir, 'analysis_report.json')):
+            return None
+        try:
+            report = copy.deepcopy(_load_cached_report(cache_key))
+            for name in OUTPUT_FILES:
+                cached_file = os.path.join(cache_dir, name)
+                if os.path.exists(cached_file):
+                    shutil.copy2(cached_file, os.path.join(output_dir, name))
+        except (OSError, ValueError):
+            return None
+        return report
+    
+    @classmethod
+    def _save_cached_report(cls, cache_key: str, output_dir: str, previous_outputs: Dict[str, int]):
+        """Copy the output files written by this run into the report cache"""
+        cache_dir = os.path.join(REPORT_CACHE_DIR, cache_key)
+        # Drop memoized reports so a refreshed analysis is not shadowed
+        _load_cached_report.cache_clear()
+        current_outputs = cls._output_mtimes(output_dir)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            for name in OUTPUT_FILES:
+                cached_file = os.path.join(cache_dir, name)
+                mtime = current_outputs.get(name)
+                if mtime is not None and mtime != previous_outputs.get(name):
+                    shutil.copy2(os.path.join(output_dir, name), cached_file)
+                elif os.path.exists(cached_file):
+                    # Skipped this run (e.g. a plot with no data), so drop any older copy
+                    os.remove(cached_file)
+        except OSError as e:
+            print(f"Warning: Could not cache analysis results: {e}")
+    
     def _parse_repo_url(self, url: str) -> Optional[Tuple[str, str]]:
         """Extract owner and repo name from GitHub URL"""
-        patterns = [
-            r'github\.com/([^/]+)/([^/]+?)(?:\.git)?/?$',
-            r'github\.com/([^/]+)/([^/]+)/tree/',
-            r'^([^/]+)/([^/]+)$'  # Direct format: owner/repo
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _REPO_URL_PATTERNS:
+            match = pattern.search(url)
             if match:
                 return match.group(1), match.group(2)
         return None
     
     def _analyze_file_structure(self, repo):
         """Analyze repository file structure"""
+        self._tree_items = None
+        self._tree_text = None
+        self._python_paths = []
         try:
-            contents = repo.get_contents("")
-            self.file_structure = self._build_file_tree(repo, contents)
+            entries = self._fetch_full_tree(repo)
+            self.file_structure = self._build_file_tree(entries)
         except Exception as e:
             print(f"Warning: Could not analyze file structure: {e}")
     
-    def _build_file_tree(self, repo, contents, path="") -> Dict:
-        """Recursively build file tree structure"""
-        tree = {}
+    def _fetch_full_tree(self, repo) -> List:
+        """Fetch every tree entry of the default branch in a single API call"""
+        if self._tree_entries is None:
+            git_tree = repo.get_git_tree(repo.default_branch, recursive=True)
+            if git_tree.raw_data.get('truncated'):
+                print("Warning: Repository tree is too large, file listing is truncated")
+            self._tree_entries = git_tree.tree
+        return self._tree_entries
+    
+    def _build_file_tree(self, entries) -> Dict:
+        """Build nested file tree structure from flat git tree entries"""
+        children_by_dir = {"": {}}
         
-        for content in contents:
-            if content.type == "dir":
-                try:
-                    subcontents = repo.get_contents(content.path)
-                    tree[content.name] = {
-                        'type': 'dir',
-                        'path': content.path,
-                        'children': self._build_file_tree(repo, subcontents, content.path)
-                    }
-                except:
-                    tree[content.name] = {'type': 'dir', 'path': content.path, 'children': {}}
-            else:
-                tree[content.name] = {
+        for entry in entries:
+            parent, _, name = entry.path.rpartition('/')
+            siblings = children_by_dir.setdefault(parent, {})
+            
+            if entry.type == "tree":
+                siblings[name] = {
+                    'type': 'dir',
+                    'path': entry.path,
+                    'children': children_by_dir.setdefault(entry.path, {})
+                }
+            elif entry.type == "blob":
+                language = self._detect_language(name)
+                siblings[name] = {
                     'type': 'file',
-                    'path': content.path,
-                    'size': content.size,
-                    'language': self._detect_language(content.name)
+                    'path': entry.path,
+                    'size': entry.size,
+                    'language': language
                 }
+                if language == 'Python':
+                    self._python_paths.append(entry.path)
         
-        return tree
+        return children_by_dir[""]
     
-    def _detect_language(self, filename: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _detect_language(filename: str) -> str:
         """Detect programming language from file extension"""
-        extensions = {
-            '.py': 'Python',
-            '.js': 'JavaScript',
-            '.ts': 'TypeScript',
-            '.java': 'Java',
-            '.cpp': 'C++',
-            '.c': 'C',
-            '.cs': 'C#',
-            '.go': 'Go',
-            '.rs': 'Rust',
-            '.php': 'PHP',
-            '.rb': 'Ruby',
-            '.swift': 'Swift',
-            '.kt': 'Kotlin',
-            '.scala': 'Scala',
-            '.r': 'R',
-            '.sql': 'SQL',
-            '.sh': 'Shell',
-            '.yml': 'YAML',
-            '.yaml': 'YAML',
-            '.json': 'JSON',
-            '.xml': 'XML',
-            '.html': 'HTML',
-            '.css': 'CSS',
-            '.md': 'Markdown'
-        }
-        
         ext = Path(filename).suffix.lower()
-        return extensions.get(ext, 'Unknown')
+        return LANGUAGE_EXTENSIONS.get(ext, 'Unknown')
     
     def _analyze_dependencies(self, repo):
         """Analyze code dependencies (focusing on Python)"""
         self.dependencies = []
         
         try:
-            # Get all Python files
-            python_files = self._get_files_by_extension(repo, '.py')
+            # Python files were collected while building the file tree
+            python_files = self._python_paths
             
-            for file_path in python_files:
-                try:
-                    file_content = repo.get_contents(file_path)
-                    if file_content.size > 1000000:  # Skip very large files
-                        continue
-                        
-                    content = base64.b64decode(file_content.content).decode('utf-8')
-                    deps = self._extract_python_imports(content, file_path)
-                    self.dependencies.extend(deps)
-                except Exception as e:
-                    print(f"Warning: Could not analyze {file_path}: {e}")
+            # Fetch file contents concurrently - each fetch is a network round-trip
+            with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+                futures = [(file_path, executor.submit(repo.get_contents, file_path))
+                           for file_path in python_files]
+                
+                # Consume results in submission order so the dependency list is reproducible
+                for file_path, future in futures:
+                    try:
+                        file_content = future.result()
+                        if file_content.size > 1000000:  # Skip very large files
+                            continue
+                            
+                        raw = file_content.decoded_content
+                        if not _IMPORT_PREFILTER.search(raw):  # No imports, skip parsing
+                            continue
+                            
+                        # utf-8-sig strips a leading BOM, which ast.parse rejects in str input
+                        content = raw.decode('utf-8-sig', 'replace')
+                        deps = self._extract_python_imports(content, file_path)
+                        self.dependencies.extend(deps)
+                    except Exception as e:
+                        print(f"Warning: Could not analyze {file_path}: {e}")
                     
         except Exception as e:
             print(f"Warning: Dependency analysis failed: {e}")
     
-    def _get_files_by_extension(self, repo, extension: str) -> List[str]:
-        """Get all files with specific extension"""
-        files = []
-        
-        def search_contents(contents, current_path=""):
-            for content in contents:
-                if content.type == "file" and content.name.endswith(extension):
-                    files.append(content.path)
-                elif content.type == "dir":
-                    try:
-                        subcontents = repo.get_contents(content.path)
-                        search_contents(subcontents, content.path)
-                    except:
-                        continue
-        
-        try:
-            initial_contents = repo.get_contents("")
-            search_contents(initial_contents)
-        except:
-            pass
-            
-        return files
-    
     def _extract_python_imports(self, content: str, file_path: str) -> List[Dependency]:
         """Extract import statements from Python code"""
         dependencies = []
@@ -248,40 +753,31 @@ class GitDiagramPlus:
         try:
             tree = ast.parse(content)
             
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        dependencies.append(Dependency(
-                            from_file=file_path,
-                            to_module=alias.name,
-                            import_type='import'
-                        ))
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        dependencies.append(Dependency(
-                            from_file=file_path,
-                            to_module=node.module,
-                            import_type='from_import'
-                        ))
+            collector = _ImportCollector(file_path)
+            collector.visit(tree)
+            dependencies = collector.dependencies
         except:
             # Fallback to regex if AST parsing fails
-            import_patterns = [
-                r'^\s*import\s+([^\s#]+)',
-                r'^\s*from\s+([^\s#]+)\s+import'
-            ]
-            
-            for line in content.split('\n'):
-                for pattern in import_patterns:
-                    match = re.match(pattern, line)
-                    if match:
-                        dependencies.append(Dependency(
-                            from_file=file_path,
-                            to_module=match.group(1),
-                            import_type='import'
-                        ))
+            for line_no, line in enumerate(content.splitlines()):
+                # Imports conventionally sit at the top; stop once past the header
+                if line_no > IMPORT_SCAN_HEADER_LINES and not line.lstrip().startswith(('import', 'from', '#')):
+                    break
+                match = _IMPORT_LINE_RE.match(line)
+                if match:
+                    import_module, from_module = match.groups()
+                    dependencies.append(Dependency(
+                        from_file=file_path,
+                        to_module=import_module or from_module,
+                        import_type='import' if import_module else 'from_import'
+                    ))
         
         return dependencies
     
+    def _analyze_activity(self, repo):
+        """Analyze commit history, then contributors (which use the commit data)"""
+        self._analyze_commit_history(repo)
+        self._analyze_contributors(repo)
+    
     def _analyze_commit_history(self, repo):
         """Analyze commit history and file change patterns"""
         try:
@@ -289,104 +785,65 @@ class GitDiagramPlus:
             since = datetime.now() - timedelta(days=180)
             commits = list(repo.get_commits(since=since))
             
-            self.commit_data = {
-                'total_commits': len(commits),
-                'file_changes': defaultdict(int),
-                'commit_frequency': defaultdict(int),
-                'authors': set()
-            }
+            # Collect raw (date, author) records and changed file names,
+            # then aggregate them in bulk below
+            commit_records = []
+            file_records = []
             
             for commit in commits[:100]:  # Limit to avoid rate limits
                 try:
-                    self.commit_data['authors'].add(commit.author.login if commit.author else 'Unknown')
-                    
-                    # Track daily commit frequency
-                    date_key = commit.commit.author.date.strftime('%Y-%m-%d')
-                    self.commit_data['commit_frequency'][date_key] += 1
+                    author = commit.author.login if commit.author else 'Unknown'
+                    commit_records.append((commit.commit.author.date, author))
                     
                     # Track file changes
                     for file in commit.files[:10]:  # Limit files per commit
-                        self.commit_data['file_changes'][file.filename] += 1
+                        file_records.append(file.filename)
                         
-                        # Track contributor ownership
-                        author = commit.author.login if commit.author else 'Unknown'
-                        self.contributor_data[author].append(file.filename)
-                        
-                except Exception as e:
-                    continue
-                    
-        except Exception as e:
-            print(f"Warning: Commit analysis failed: {e}")
-            self.commit_data = {'total_commits': 0, 'file_changes': {}, 'commit_frequency': {}, 'authors': set()}
-    
-    def _analyze_contributors(self, repo):
-        """Analyze contributor patterns and ownership"""
-        try:
-            contributors = list(repo.get_contributors())
-            
-            # Get top contributors
-            self.contributor_stats = {}
-            for contributor in contributors[:20]:  # Top 20 contributors
-                self.contributor_stats[contributor.login] = {
-                    'contributions': contributor.contributions,
-                    'files_owned': len(set(self.contributor_data.get(contributor.login, []))),
-                    'primary_files': Counter(self.contributor_data.get(contributor.login, [])).most_common(5)
-                }
-                
-        except Exception as e:
-            print(f"Warning: Contributor analysis failed: {e}")
-            self.contributor_stats = {}
-    
-    def _generate_documentation(self, repo, output_dir: str):
-        """Generate auto-documentation"""
-        
-        # Auto-README generator
-        readme_template = Template("""
-# {{ repo_name }}
-
-{{ description }}
-
-## 📊 Repository Overview
-- **Language**: {{ language }}
-- **Stars**: {{ stars }}
-- **Forks**: {{ forks }}
-- **Created**: {{ created_at }}
-- **Last Updated**: {{ updated_at }}
-
-## 📁 Project Structure
-```
-{{ file_structure }}
-```
-
-## 🔗 Dependencies
-{% if top_dependencies %}
-### Top Dependencies:
-{% for dep in top_dependencies %}
-- {{ dep }}
-{% endfor %}
-{% endif %}
-
-## 👥 Contributors
-{% if contributors %}
-### Top Contributors:
-{% for contributor, stats in contributors.items() %}
-- **{{ contributor }}**: {{ stats.contributions }} contributions
-{% endfor %}
-{% endif %}
-
-## 📈 Activity
-- Total commits analyzed: {{ total_commits }}
-- Active contributors: {{ active_contributors }}
-
----
-*Generated by GitDiagram++ - Repository Visualizer & Analyzer*
-        """)
+                        # Track contributor ownership
+                        self.contributor_data[author][file.filename] += 1
+                        
+                except Exception as e:
+                    continue
+            
+            self.commit_data = {
+                'total_commits': len(commits),
+                'file_changes': Counter(file_records),
+                'commit_frequency': Counter(date.strftime('%Y-%m-%d') for date, _ in commit_records),
+                'authors': {author for _, author in commit_records}
+            }
+                    
+        except Exception as e:
+            print(f"Warning: Commit analysis failed: {e}")
+            self.commit_data = {'total_commits': 0, 'file_changes': {}, 'commit_frequency': {}, 'authors': set()}
+    
+    def _analyze_contributors(self, repo):
+        """Analyze contributor patterns and ownership"""
+        try:
+            contributors = list(repo.get_contributors())
+            
+            # Get top contributors
+            self.contributor_stats = {}
+            for contributor in contributors[:20]:  # Top 20 contributors
+                file_counts = self.contributor_data.get(contributor.login, Counter())
+                self.contributor_stats[contributor.login] = {
+                    'contributions': contributor.contributions,
+                    'files_owned': len(file_counts),
+                    'primary_files': file_counts.most_common(5)
+                }
+                
+        except Exception as e:
+            print(f"Warning: Contributor analysis failed: {e}")
+            self.contributor_stats = {}
+    
+    def _generate_documentation(self, repo, output_dir: str):
+        """Generate auto-documentation"""
         
-        # Prepare data for template
-        file_structure_str = self._format_file_structure(self.file_structure)
-        top_deps = list(set([dep.to_module for dep in self.dependencies[:10]]))
+        # Prepare data for the auto-README template
+        file_structure_str = self._format_file_structure()
+        top_deps = list(dict.fromkeys(dep.to_module for dep in self.dependencies))[:10]
         
-        readme_content = readme_template.render(
+        # Stream the auto-generated README straight to disk
+        self.template_env.get_template(self.readme_template).stream(
             repo_name=self.repo_data['name'],
             description=self.repo_data.get('description', 'No description available'),
             language=self.repo_data.get('language', 'Unknown'),
@@ -399,29 +856,51 @@ class GitDiagramPlus:
             contributors=dict(list(self.contributor_stats.items())[:5]),
             total_commits=self.commit_data.get('total_commits', 0),
             active_contributors=len(self.commit_data.get('authors', []))
-        )
-        
-        # Save auto-generated README
-        with open(f"{output_dir}/AUTO_README.md", 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+        ).dump(f"{output_dir}/AUTO_README.md", encoding='utf-8')
     
-    def _format_file_structure(self, structure: Dict, indent: int = 0) -> str:
-        """Format file structure as text tree"""
-        result = []
-        prefix = "  " * indent
+    def _walk_tree(self):
+        """Walk the file structure once in sorted depth-first order
         
-        for name, data in sorted(structure.items()):
-            if data['type'] == 'dir':
-                result.append(f"{prefix}📁 {name}/")
-                if 'children' in data:
-                    result.append(self._format_file_structure(data['children'], indent + 1))
-            else:
-                icon = self._get_file_icon(data.get('language', ''))
-                result.append(f"{prefix}{icon} {name}")
+        Yields (name, data, depth, parent_id, node_id) tuples, where the ids
+        are the Mermaid node identifiers of the entry and its parent.
+        """
+        stack = [(name, data, 0, "root") for name, data in sorted(self.file_structure.items(), reverse=True)]
         
-        return '\n'.join(filter(None, result))
+        while stack:
+            name, data, depth, parent_id = stack.pop()
+            node_id = f"{parent_id}_{name}".replace("/", "_").replace(".", "_").replace("-", "_")
+            yield name, data, depth, parent_id, node_id
+            
+            if data['type'] == 'dir':
+                # Children are pushed in reverse so they pop in sorted order
+                stack.extend((child_name, child_data, depth + 1, node_id) for child_name, child_data
+                             in sorted(data.get('children', {}).items(), reverse=True))
+    
+    def _get_tree_items(self) -> List[Tuple]:
+        """Get the flattened file structure, walking the tree only on first use"""
+        if self._tree_items is None:
+            self._tree_items = list(self._walk_tree())
+        return self._tree_items
+    
+    def _format_file_structure(self) -> str:
+        """Format file structure as text tree (built once, shared by README and HTML report)"""
+        if self._tree_text is None:
+            lines = []
+            
+            for name, data, depth, _, _ in self._get_tree_items():
+                prefix = "  " * depth
+                if data['type'] == 'dir':
+                    lines.append(f"{prefix}📁 {name}/")
+                else:
+                    icon = self._get_file_icon(data.get('language', ''))
+                    lines.append(f"{prefix}{icon} {name}")
+            
+            self._tree_text = '\n'.join(lines)
+        return self._tree_text
     
-    def _get_file_icon(self, language: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_file_icon(language: str) -> str:
         """Get emoji icon for file type"""
         icons = {
             'Python': '🐍',
@@ -446,80 +925,53 @@ class GitDiagramPlus:
         # 1. File Structure Diagram (Mermaid)
         self._create_mermaid_structure_diagram(output_dir)
         
-        # 2. Dependency Graph
-        self._create_dependency_graph(output_dir)
-        
-        # 3. Commit Heatmap
-        self._create_commit_heatmap(output_dir)
-        
-        # 4. Language Distribution
-        self._create_language_distribution(output_dir)
+        # The plots are independent and CPU-bound, so render them in separate processes
+        repo_name = self.repo_data['name']
+        plot_jobs = [
+            # 2. Dependency Graph
+            (self._create_dependency_graph, repo_name, self.dependencies),
+            # 3. Commit Heatmap
+            (self._create_commit_heatmap, repo_name, self.commit_data.get('commit_frequency', {})),
+            # 4. Language Distribution
+            (self._create_language_distribution, repo_name, self._count_languages()),
+            # 5. Contributor Analysis
+            (self._create_contributor_analysis, repo_name, self.contributor_stats)
+        ]
         
-        # 5. Contributor Analysis
-        self._create_contributor_analysis(output_dir)
+        with ProcessPoolExecutor(max_workers=len(plot_jobs)) as executor:
+            futures = [executor.submit(plot, name, data, output_dir) for plot, name, data in plot_jobs]
+            for future in futures:
+                future.result()
+    
+    def _count_languages(self) -> Counter:
+        """Count files per detected language"""
+        return Counter(data.get('language', 'Unknown') for _, data, _, _, _ in self._get_tree_items()
+                       if data['type'] == 'file')
     
     def _create_mermaid_structure_diagram(self, output_dir: str):
         """Generate Mermaid.js diagram for file structure"""
-        mermaid_content = ["graph TD"]
+        mermaid_content = ["graph TD", '    root[🏠 Repository]']
         
-        def add_to_mermaid(structure: Dict, parent_id: str = "root"):
-            for name, data in structure.items():
-                node_id = f"{parent_id}_{name}".replace("/", "_").replace(".", "_").replace("-", "_")
-                
-                if data['type'] == 'dir':
-                    mermaid_content.append(f'    {node_id}[📁 {name}]')
-                    if parent_id != "root":
-                        mermaid_content.append(f'    {parent_id} --> {node_id}')
-                    
-                    if 'children' in data:
-                        add_to_mermaid(data['children'], node_id)
-                else:
-                    icon = self._get_file_icon(data.get('language', ''))
-                    mermaid_content.append(f'    {node_id}[{icon} {name}]')
+        for name, data, _, parent_id, node_id in self._get_tree_items():
+            if data['type'] == 'dir':
+                mermaid_content.append(f'    {node_id}[📁 {name}]')
+                if parent_id != "root":
                     mermaid_content.append(f'    {parent_id} --> {node_id}')
-        
-        mermaid_content.append('    root[🏠 Repository]')
-        add_to_mermaid(self.file_structure)
+            else:
+                icon = self._get_file_icon(data.get('language', ''))
+                mermaid_content.append(f'    {node_id}[{icon} {name}]')
+                mermaid_content.append(f'    {parent_id} --> {node_id}')
         
         # Create HTML file with Mermaid
-        html_template = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>{{ repo_name }} - File Structure</title>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/mermaid/10.6.1/mermaid.min.js"></script>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
-        .container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-        h1 { color: #333; text-align: center; }
-        .mermaid { text-align: center; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📁 {{ repo_name }} - File Structure</h1>
-        <div class="mermaid">
-{{ mermaid_diagram }}
-        </div>
-    </div>
-    <script>
-        mermaid.initialize({startOnLoad:true, theme: 'default'});
-    </script>
-</body>
-</html>
-        """
-        
-        html_content = Template(html_template).render(
+        self.template_env.get_template(self.structure_template).stream(
             repo_name=self.repo_data['name'],
             mermaid_diagram='\n'.join(mermaid_content)
-        )
-        
-        with open(f"{output_dir}/file_structure.html", 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        ).dump(f"{output_dir}/file_structure.html", encoding='utf-8')
     
-    def _create_dependency_graph(self, output_dir: str):
+    @staticmethod
+    def _create_dependency_graph(repo_name: str, dependencies: List[Dependency], output_dir: str):
         """Create dependency graph visualization"""
-        if not self.dependencies:
+        if not dependencies:
             return
         
         plt.figure(figsize=(12, 8))
@@ -528,7 +980,7 @@ class GitDiagramPlus:
         G = nx.DiGraph()
         
         # Add nodes and edges
-        for dep in self.dependencies:
+        for dep in dependencies:
             file_name = Path(dep.from_file).stem
             module_name = dep.to_module.split('.')[0]  # Get root module
             
@@ -548,41 +1000,39 @@ class GitDiagramPlus:
         # Draw labels
         nx.draw_networkx_labels(G, pos, font_size=8, font_weight='bold')
         
-        plt.title(f"Dependency Graph - {self.repo_data['name']}", fontsize=16, fontweight='bold')
+        plt.title(f"Dependency Graph - {repo_name}", fontsize=16, fontweight='bold')
         plt.axis('off')
         plt.tight_layout()
         plt.savefig(f"{output_dir}/dependency_graph.png", dpi=300, bbox_inches='tight')
         plt.close()
     
-    def _create_commit_heatmap(self, output_dir: str):
+    @staticmethod
+    def _create_commit_heatmap(repo_name: str, commit_frequency: Dict[str, int], output_dir: str):
         """Create commit activity heatmap"""
-        if not self.commit_data.get('commit_frequency'):
+        if not commit_frequency:
             return
         
         # Prepare data for heatmap
-        dates = list(self.commit_data['commit_frequency'].keys())
-        commits = list(self.commit_data['commit_frequency'].values())
+        dates = pd.to_datetime(list(commit_frequency.keys()))
+        commits = np.fromiter(commit_frequency.values(), dtype=np.int32, count=len(commit_frequency))
         
-        if not dates:
-            return
-        
-        # Create DataFrame
-        df = pd.DataFrame({
-            'date': pd.to_datetime(dates),
-            'commits': commits
-        })
+        # Columns are weeks counted from the Monday of the earliest week,
+        # so ranges spanning a new year stay in chronological order
+        weekdays = dates.weekday.to_numpy()
+        week_starts = dates - pd.to_timedelta(weekdays, unit='D')
+        first_week = week_starts.min()
+        weeks = ((week_starts - first_week).days // 7).to_numpy()
         
-        df['weekday'] = df['date'].dt.day_name()
-        df['week'] = df['date'].dt.isocalendar().week
-        
-        # Create pivot table for heatmap
-        heatmap_data = df.pivot_table(values='commits', index='weekday', 
-                                     columns='week', fill_value=0)
+        heatmap_data = np.zeros((7, weeks.max() + 1), dtype=np.int32)
+        np.add.at(heatmap_data, (weekdays, weeks), commits)
+        week_labels = [(first_week + pd.Timedelta(weeks=i)).isocalendar()[1]
+                       for i in range(heatmap_data.shape[1])]
         
         plt.figure(figsize=(15, 6))
         sns.heatmap(heatmap_data, annot=True, fmt='d', cmap='YlOrRd', 
+                   xticklabels=week_labels, yticklabels=DAY_NAMES,
                    cbar_kws={'label': 'Number of Commits'})
-        plt.title(f"Commit Activity Heatmap - {self.repo_data['name']}", 
+        plt.title(f"Commit Activity Heatmap - {repo_name}", 
                  fontsize=16, fontweight='bold')
         plt.xlabel('Week of Year')
         plt.ylabel('Day of Week')
@@ -590,20 +1040,9 @@ class GitDiagramPlus:
         plt.savefig(f"{output_dir}/commit_heatmap.png", dpi=300, bbox_inches='tight')
         plt.close()
     
-    def _create_language_distribution(self, output_dir: str):
+    @staticmethod
+    def _create_language_distribution(repo_name: str, languages: Dict[str, int], output_dir: str):
         """Create language distribution chart"""
-        languages = defaultdict(int)
-        
-        def count_languages(structure: Dict):
-            for name, data in structure.items():
-                if data['type'] == 'file':
-                    lang = data.get('language', 'Unknown')
-                    languages[lang] += 1
-                elif data['type'] == 'dir' and 'children' in data:
-                    count_languages(data['children'])
-        
-        count_languages(self.file_structure)
-        
         if not languages:
             return
         
@@ -629,21 +1068,22 @@ class GitDiagramPlus:
         wedges, texts, autotexts = plt.pie(sizes, labels=labels, autopct='%1.1f%%',
                                           colors=colors, startangle=90)
         
-        plt.title(f"Language Distribution - {self.repo_data['name']}", 
+        plt.title(f"Language Distribution - {repo_name}", 
                  fontsize=16, fontweight='bold')
         plt.axis('equal')
         plt.tight_layout()
         plt.savefig(f"{output_dir}/language_distribution.png", dpi=300, bbox_inches='tight')
         plt.close()
     
-    def _create_contributor_analysis(self, output_dir: str):
+    @staticmethod
+    def _create_contributor_analysis(repo_name: str, contributor_stats: Dict, output_dir: str):
         """Create contributor analysis visualization"""
-        if not self.contributor_stats:
+        if not contributor_stats:
             return
         
         # Prepare data
-        contributors = list(self.contributor_stats.keys())[:10]  # Top 10
-        contributions = [self.contributor_stats[c]['contributions'] for c in contributors]
+        contributors = list(contributor_stats.keys())[:10]  # Top 10
+        contributions = [contributor_stats[c]['contributions'] for c in contributors]
         
         plt.figure(figsize=(12, 6))
         
@@ -654,7 +1094,7 @@ class GitDiagramPlus:
         # Customize chart
         plt.xlabel('Contributors')
         plt.ylabel('Number of Contributions')
-        plt.title(f"Top Contributors - {self.repo_data['name']}", 
+        plt.title(f"Top Contributors - {repo_name}", 
                  fontsize=16, fontweight='bold')
         plt.xticks(range(len(contributors)), contributors, rotation=45, ha='right')
         
@@ -672,7 +1112,7 @@ class GitDiagramPlus:
         """Generate comprehensive analysis report"""
         
         # Calculate statistics
-        total_files = self._count_files(self.file_structure)
+        total_files = self._count_files()
         most_changed_files = sorted(self.commit_data.get('file_changes', {}).items(), 
                                    key=lambda x: x[1], reverse=True)[:10]
         
@@ -689,30 +1129,23 @@ class GitDiagramPlus:
         }
         
         # Save report as JSON
-        with open(f"{output_dir}/analysis_report.json", 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, default=str, ensure_ascii=False)
+        _write_json(report, f"{output_dir}/analysis_report.json")
         
         # Create summary HTML report
         self._create_html_report(report, output_dir)
         
         return report
     
-    def _count_files(self, structure: Dict) -> int:
+    def _count_files(self) -> int:
         """Count total files in structure"""
-        count = 0
-        for name, data in structure.items():
-            if data['type'] == 'file':
-                count += 1
-            elif data['type'] == 'dir' and 'children' in data:
-                count += self._count_files(data['children'])
-        return count
+        return sum(1 for _, data, _, _, _ in self._get_tree_items() if data['type'] == 'file')
     
     def _generate_insights(self) -> List[str]:
         """Generate insights based on analysis"""
         insights = []
         
         # File structure insights
-        total_files = self._count_files(self.file_structure)
+        total_files = self._count_files()
         if total_files > 100:
             insights.append("🏗️ Large codebase detected - consider modularization")
         
@@ -740,195 +1173,88 @@ class GitDiagramPlus:
     
     def _create_html_report(self, report: Dict, output_dir: str):
         """Create comprehensive HTML report"""
-        html_template = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>{{ repo_name }} - Analysis Report</title>
-    <style>
-        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; background: #f8f9fa; }
-        .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
-        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; border-radius: 12px; margin-bottom: 30px; text-align: center; }
-        .card { background: white; padding: 25px; margin-bottom: 25px; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
-        .stat-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; }
-        .stat-item { text-align: center; padding: 20px; background: #f8f9fa; border-radius: 8px; }
-        .stat-number { font-size: 2em; font-weight: bold; color: #667eea; display: block; }
-        .stat-label { color: #666; margin-top: 5px; }
-        .insights { background: #e8f5e8; border-left: 4px solid #28a745; padding: 20px; }
-        .insight-item { margin: 10px 0; padding: 8px 0; }
-        .files-list { max-height: 300px; overflow-y: auto; background: #f8f9fa; padding: 15px; border-radius: 8px; }
-        h1, h2, h3 { color: #333; }
-        .nav { background: white; padding: 15px; border-radius: 8px; margin-bottom: 20px; }
-        .nav a { margin-right: 15px; color: #667eea; text-decoration: none; font-weight: 500; }
-        .nav a:hover { text-decoration: underline; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🔍 {{ repo_name }}</h1>
-            <p>{{ description }}</p>
-            <p><strong>{{ language }}</strong> • ⭐ {{ stars }} • 🍴 {{ forks }}</p>
-        </div>
-        
-        <div class="nav">
-            <a href="#overview">📊 Overview</a>
-            <a href="#structure">📁 Structure</a>
-            <a href="#dependencies">🔗 Dependencies</a>
-            <a href="#activity">📈 Activity</a>
-            <a href="#insights">💡 Insights</a>
-        </div>
-
-        <div id="overview" class="card">
-            <h2>📊 Repository Overview</h2>
-            <div class="stat-grid">
-                <div class="stat-item">
-                    <span class="stat-number">{{ total_files }}</span>
-                    <div class="stat-label">Total Files</div>
-                </div>
-                <div class="stat-item">
-                    <span class="stat-number">{{ total_dependencies }}</span>
-                    <div class="stat-label">Dependencies</div>
-                </div>
-                <div class="stat-item">
-                    <span class="stat-number">{{ total_commits }}</span>
-                    <div class="stat-label">Commits Analyzed</div>
-                </div>
-                <div class="stat-item">
-                    <span class="stat-number">{{ active_contributors }}</span>
-                    <div class="stat-label">Active Contributors</div>
-                </div>
-            </div>
-        </div>
-
-        <div id="structure" class="card">
-            <h2>📁 File Structure</h2>
-            <p><a href="file_structure.html" target="_blank">🎨 View Interactive Diagram</a></p>
-            <div class="files-list">
-                <pre>{{ file_structure_text }}</pre>
-            </div>
-        </div>
-
-        <div id="dependencies" class="card">
-            <h2>🔗 Dependencies Analysis</h2>
-            {% if dependencies %}
-            <p>Dependency graph shows relationships between modules.</p>
-            <p><a href="dependency_graph.png" target="_blank">📊 View Dependency Graph</a></p>
-            <h3>Top Dependencies:</h3>
-            <ul>
-            {% for dep in top_dependencies %}
-                <li><code>{{ dep }}</code></li>
-            {% endfor %}
-            </ul>
-            {% else %}
-            <p>No dependencies detected or analysis unavailable.</p>
-            {% endif %}
-        </div>
-
-        <div id="activity" class="card">
-            <h2>📈 Repository Activity</h2>
-            {% if most_changed_files %}
-            <h3>Most Frequently Changed Files:</h3>
-            <ol>
-            {% for file, changes in most_changed_files %}
-                <li><code>{{ file }}</code> - {{ changes }} changes</li>
-            {% endfor %}
-            </ol>
-            <p><a href="commit_heatmap.png" target="_blank">🔥 View Commit Heatmap</a></p>
-            {% endif %}
-            
-            <p><a href="language_distribution.png" target="_blank">📊 View Language Distribution</a></p>
-            <p><a href="contributor_analysis.png" target="_blank">👥 View Contributor Analysis</a></p>
-        </div>
-
-        <div id="insights" class="card">
-            <h2>💡 Analysis Insights</h2>
-            <div class="insights">
-            {% for insight in insights %}
-                <div class="insight-item">{{ insight }}</div>
-            {% endfor %}
-            </div>
-        </div>
-
-        <div class="card">
-            <h2>📋 Generated Files</h2>
-            <ul>
-                <li><a href="AUTO_README.md">📝 Auto-generated README</a></li>
-                <li><a href="analysis_report.json">📊 Detailed JSON Report</a></li>
-                <li><a href="file_structure.html">🌳 Interactive File Structure</a></li>
-                <li><a href="dependency_graph.png">🔗 Dependency Graph</a></li>
-                <li><a href="commit_heatmap.png">🔥 Commit Heatmap</a></li>
-                <li><a href="language_distribution.png">📈 Language Distribution</a></li>
-                <li><a href="contributor_analysis.png">👥 Contributor Analysis</a></li>
-            </ul>
-        </div>
-    </div>
-</body>
-</html>
-        """
         
         # Get top dependencies
-        dep_counter = Counter([dep.to_module for dep in self.dependencies])
-        top_deps = [dep for dep, _ in dep_counter.most_common(10)]
+        dep_counter = Counter(dep.to_module for dep in self.dependencies)
+        top_deps = list(map(itemgetter(0), dep_counter.most_common(10)))
         
         # Format file structure
-        file_structure_text = self._format_file_structure(self.file_structure)
-        
-        html_content = Template(html_template).render(
-            repo_name=report['repository']['name'],
-            description=report['repository'].get('description', 'No description available'),
-            language=report['repository'].get('language', 'Unknown'),
-            stars=report['repository'].get('stars', 0),
-            forks=report['repository'].get('forks', 0),
-            total_files=report['analysis_summary']['total_files'],
-            total_dependencies=report['analysis_summary']['total_dependencies'],
-            total_commits=report['analysis_summary']['total_commits_analyzed'],
-            active_contributors=report['analysis_summary']['active_contributors'],
-            file_structure_text=file_structure_text,
+        file_structure_text = self._format_file_structure()
+        
+        repository = report['repository']
+        summary = report['analysis_summary']
+        
+        # Numbers are safe and the text values are escaped once here, so the
+        # autoescaping template has nothing left to escape per substitution
+        self.template_env.get_template(self.report_template).stream(
+            repo_name=repository['name'],
+            description=repository.get('description', 'No description available'),
+            language=repository.get('language', 'Unknown'),
+            stars=Markup(int(repository.get('stars', 0))),
+            forks=Markup(int(repository.get('forks', 0))),
+            total_files=Markup(int(summary['total_files'])),
+            total_dependencies=Markup(int(summary['total_dependencies'])),
+            total_commits=Markup(int(summary['total_commits_analyzed'])),
+            active_contributors=Markup(int(summary['active_contributors'])),
+            file_structure_text=escape(file_structure_text),
             dependencies=self.dependencies,
-            top_dependencies=top_deps,
-            most_changed_files=report['analysis_summary']['most_changed_files'][:10],
-            insights=report['insights']
-        )
-        
-        with open(f"{output_dir}/index.html", 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            top_dependencies=[escape(dep) for dep in top_deps],
+            most_changed_files=[(escape(file), Markup(int(changes))) for file, changes
+                                in summary['most_changed_files'][:10]],
+            insights=[escape(insight) for insight in report['insights']],
+            report_json=Markup(_json_for_html(report))
+        ).dump(f"{output_dir}/index.html", encoding='utf-8')
 
 def main():
     """Main CLI interface"""
+    import argparse  # Only needed when arguments are given
+    
     parser = argparse.ArgumentParser(description='GitDiagram++ - Repository Visualizer & Analyzer')
     parser.add_argument('repo_url', help='GitHub repository URL or owner/repo format')
     parser.add_argument('-t', '--token', help='GitHub personal access token')
     parser.add_argument('-o', '--output', default='output', help='Output directory (default: output)')
     parser.add_argument('--format', choices=['html', 'json', 'all'], default='all', 
                        help='Output format (default: all)')
+    parser.add_argument('--no-api-cache', action='store_true',
+                       help='Do not cache GitHub API responses on disk')
+    parser.add_argument('--no-template-cache', action='store_true',
+                       help='Do not cache compiled report templates on disk')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not reuse or save analysis results from earlier runs')
+    parser.add_argument('--refresh', action='store_true',
+                       help='Re-analyze even if cached results exist, then update the cache')
     
     args = parser.parse_args()
     
     try:
         # Initialize analyzer
-        analyzer = GitDiagramPlus(args.token)
+        analyzer = GitDiagramPlus(args.token, api_cache=not args.no_api_cache,
+                                  template_cache=not args.no_template_cache,
+                                  report_cache=not args.no_cache)
         
         # Analyze repository
-        report = analyzer.analyze_repository(args.repo_url, args.output)
-        
-        print("\n🎉 Analysis Complete!")
-        print(f"📁 Results saved to: {args.output}/")
-        print(f"🌐 Open {args.output}/index.html to view the complete report")
-        
-        # Print summary
-        print("\n📋 Quick Summary:")
-        print(f"  • Repository: {report['repository']['name']}")
-        print(f"  • Total Files: {report['analysis_summary']['total_files']}")
-        print(f"  • Dependencies: {report['analysis_summary']['total_dependencies']}")
-        print(f"  • Commits Analyzed: {report['analysis_summary']['total_commits_analyzed']}")
-        print(f"  • Contributors: {report['analysis_summary']['active_contributors']}")
+        report = analyzer.analyze_repository(args.repo_url, args.output, refresh=args.refresh)
+        
+        # Collect the summary and write it in one go
+        summary = report['analysis_summary']
+        out = [
+            "\n🎉 Analysis Complete!",
+            f"📁 Results saved to: {args.output}/",
+            f"🌐 Open {args.output}/index.html to view the complete report",
+            "\n📋 Quick Summary:",
+            f"  • Repository: {report['repository']['name']}",
+            f"  • Total Files: {summary['total_files']}",
+            f"  • Dependencies: {summary['total_dependencies']}",
+            f"  • Commits Analyzed: {summary['total_commits_analyzed']}",
+            f"  • Contributors: {summary['active_contributors']}"
+        ]
         
         if report['insights']:
-            print("\n💡 Key Insights:")
-            for insight in report['insights'][:3]:
-                print(f"  • {insight}")
+            out.append("\n💡 Key Insights:")
+            out.extend(f"  • {insight}" for insight in report['insights'][:3])
         
+        sys.stdout.write('\n'.join(out) + '\n')
+    
     except Exception as e:
         print(f"❌ Error: {e}")
         return 1
@@ -950,18 +1276,19 @@ class DemoRunner:
         try:
             report = analyzer.analyze_repository(repo_url, "demo_output")
             
-            print("\n📊 Demo Results:")
-            print(f"Repository: {report['repository']['name']}")
-            print(f"Language: {report['repository'].get('language', 'Unknown')}")
-            print(f"Files analyzed: {report['analysis_summary']['total_files']}")
-            print(f"Dependencies found: {report['analysis_summary']['total_dependencies']}")
-            
-            print("\n💡 Sample Insights:")
-            for insight in report['insights'][:3]:
-                print(f"  • {insight}")
-                
-            print(f"\n🎨 Open demo_output/index.html to see the full visualization!")
+            out = [
+                "\n📊 Demo Results:",
+                f"Repository: {report['repository']['name']}",
+                f"Language: {report['repository'].get('language', 'Unknown')}",
+                f"Files analyzed: {report['analysis_summary']['total_files']}",
+                f"Dependencies found: {report['analysis_summary']['total_dependencies']}",
+                "\n💡 Sample Insights:"
+            ]
+            out.extend(f"  • {insight}" for insight in report['insights'][:3])
+            out.append("\n🎨 Open demo_output/index.html to see the full visualization!")
             
+            sys.stdout.write('\n'.join(out) + '\n')
+        
         except Exception as e:
             print(f"Demo failed: {e}")
 
@@ -970,19 +1297,27 @@ class RepoCloner:
     """Utility to clone repositories for deeper analysis"""
     
     @staticmethod
-    def clone_and_analyze(repo_url: str, local_path: str = "temp_repo") -> Dict:
+    def clone_and_analyze(repo_url: str, local_path: str = "temp_repo", full_history: bool = False) -> Dict:
         """Clone repo locally for advanced analysis"""
+        import subprocess  # Only needed for local clones
+        
         try:
-            # Clone repository
-            subprocess.run(['git', 'clone', repo_url, local_path], 
-                          check=True, capture_output=True)
+            # Clone repository; only the latest snapshot is analyzed, so skip history by default
+            clone_args = ['git', 'clone']
+            if not full_history:
+                clone_args += ['--depth=1', '--filter=blob:none', '--single-branch']
+            
+            subprocess.run(clone_args + [repo_url, local_path], 
+                          check=True, capture_output=True,
+                          env={**os.environ, 'GIT_TERMINAL_PROMPT': '0'})
             
             # Analyze local repository
+            line_count, file_types, complexity = RepoCloner._analyze_local_files(local_path)
             analysis = {
                 'local_path': local_path,
-                'line_count': RepoCloner._count_lines_of_code(local_path),
-                'file_types': RepoCloner._analyze_file_types(local_path),
-                'complexity': RepoCloner._analyze_complexity(local_path)
+                'line_count': line_count,
+                'file_types': file_types,
+                'complexity': complexity
             }
             
             return analysis
@@ -992,77 +1327,98 @@ class RepoCloner:
             return {}
     
     @staticmethod
-    def _count_lines_of_code(path: str) -> Dict[str, int]:
-        """Count lines of code by language"""
-        extensions = {
-            '.py': 'Python',
-            '.js': 'JavaScript',
-            '.java': 'Java',
-            '.cpp': 'C++',
-            '.c': 'C'
-        }
-        
-        line_counts = defaultdict(int)
-        
-        for root, dirs, files in os.walk(path):
-            # Skip hidden directories and common ignore patterns
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__']]
+    def _scan_files(path: str):
+        """Yield (file_path, size, extension) for files, skipping hidden and ignored directories"""
+        stack = [path]
+        
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
             
-            for file in files:
-                ext = Path(file).suffix.lower()
-                if ext in extensions:
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    # Entries can vanish or become unreadable mid-scan; skip them rather than abort
                     try:
-                        file_path = os.path.join(root, file)
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            lines = len(f.readlines())
-                        line_counts[extensions[ext]] += lines
-                    except:
+                        if entry.is_dir(follow_symlinks=False):
+                            if name[0] != '.' and name not in _IGNORE_DIRS:
+                                stack.append(entry.path)
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        # scandir usually has the stat cached, so this rarely costs a syscall
+                        size = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
                         continue
-        
-        return dict(line_counts)
+                    
+                    # Cheaper than Path(name).suffix; a leading (".gitignore") or trailing ("file.") dot is not an extension
+                    dot = name.rfind('.')
+                    ext = name[dot:].lower() if 0 < dot < len(name) - 1 else ''
+                    yield entry.path, size, ext
     
     @staticmethod
-    def _analyze_file_types(path: str) -> Dict[str, int]:
-        """Analyze distribution of file types"""
-        file_types = defaultdict(int)
-        
-        for root, dirs, files in os.walk(path):
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
+    def _analyze_local_files(path: str) -> Tuple[Dict[str, int], Dict[str, int], Dict[str, float]]:
+        """Count lines of code by language, file types and file sizes in one directory walk"""
+        line_counts = Counter()
+        file_types = Counter()
+        extensions = []
+        total_size = max_size = file_count = 0
+        
+        # Line counting is I/O bound, so it overlaps with the rest of the walk
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+            line_jobs = []
+            code_language = CODE_EXTENSIONS.get
             
-            for file in files:
-                ext = Path(file).suffix.lower() or 'no_extension'
-                file_types[ext] += 1
+            for file_path, size, ext in RepoCloner._scan_files(path):
+                extensions.append(ext or 'no_extension')
+                total_size += size
+                if size > max_size:
+                    max_size = size
+                file_count += 1
+                
+                language = code_language(ext)
+                if language:
+                    line_jobs.append((language, executor.submit(RepoCloner._count_file_lines, file_path)))
+            
+            file_types.update(extensions)
+            
+            for language, future in line_jobs:
+                try:
+                    line_counts.update({language: future.result()})
+                except OSError:
+                    continue
         
-        return dict(file_types)
-    
-    @staticmethod
-    def _analyze_complexity(path: str) -> Dict[str, float]:
-        """Basic complexity analysis"""
+        # Basic complexity analysis
         complexity = {
             'avg_file_size': 0,
             'max_file_size': 0,
             'total_files': 0
         }
         
-        file_sizes = []
-        
-        for root, dirs, files in os.walk(path):
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for file in files:
-                try:
-                    file_path = os.path.join(root, file)
-                    size = os.path.getsize(file_path)
-                    file_sizes.append(size)
-                except:
-                    continue
-        
-        if file_sizes:
-            complexity['avg_file_size'] = sum(file_sizes) / len(file_sizes)
-            complexity['max_file_size'] = max(file_sizes)
-            complexity['total_files'] = len(file_sizes)
+        if file_count:
+            complexity.update(avg_file_size=total_size / file_count,
+                              max_file_size=max_size,
+                              total_files=file_count)
         
-        return complexity
+        return dict(line_counts), dict(file_types), complexity
+    
+    @staticmethod
+    def _count_file_lines(file_path: str) -> int:
+        """Count lines in a file by scanning raw bytes in fixed-size chunks"""
+        lines = 0
+        last_chunk = b''
+        
+        with open(file_path, 'rb', buffering=0) as f:
+            while chunk := f.read(LINE_COUNT_CHUNK_SIZE):
+                lines += chunk.count(b'\n')
+                last_chunk = chunk
+        
+        # A final line without a trailing newline still counts
+        if last_chunk and not last_chunk.endswith(b'\n'):
+            lines += 1
+        return lines
 
 # Configuration and setup
 class Config:
@@ -1137,11 +1493,5 @@ def interactive_mode():
         return 1
 
 if __name__ == "__main__":
-    import sys
-    
-    if len(sys.argv) == 1:
-        # Run in interactive mode if no arguments
-        sys.exit(interactive_mode())
-    else:
-        # Run with command line arguments
-        sys.exit(main())
\ No newline at end of file
+    # Run in interactive mode if no arguments, otherwise parse the command line
+    sys.exit(interactive_mode() if len(sys.argv) == 1 else main())
\ No newline at end of file